@@ -5,12 +5,21 @@ A Model Context Protocol server that interfaces with various APIs
 """
 
 import asyncio
-import json
+import collections
+import hashlib
 import logging
+import os
+import pickle
+import random
+import string
+import time
+from types import MappingProxyType
 from typing import Any, Dict, List, Optional, Sequence
 from urllib.parse import urljoin
 import httpx
-from pydantic import BaseModel, Field
+import orjson
+import yaml
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 # MCP SDK imports
 from mcp.server import Server, NotificationOptions
@@ -22,57 +31,527 @@ import mcp.types as types
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Maximum number of cached GET responses kept in memory
+CACHE_MAX_ENTRIES = 256
+
+# Transient upstream statuses worth retrying, and the default backoff policy
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+DEFAULT_RETRY_POLICY = {
+    "max_retries": 3,
+    "base_delay": 0.5,
+    "max_delay": 30.0,
+    "jitter": 0.25
+}
+
+# Input schemas shared across list_tools calls; frozen so every Tool can
+# safely reference the same object instead of allocating a copy per call
+_TOOL_INPUT_SCHEMA = MappingProxyType({
+    "type": "object",
+    "properties": {
+        "params": {
+            "type": "object",
+            "description": "Query parameters for the API call"
+        },
+        "path_params": {
+            "type": "object",
+            "description": "Values for {placeholders} in the endpoint path"
+        },
+        "data": {
+            "type": "object",
+            "description": "Request body data (for POST/PUT requests)"
+        },
+        "json": {
+            "type": "object",
+            "description": "JSON data for the request"
+        }
+    }
+})
+
+_CALL_API_SCHEMA = MappingProxyType({
+    "type": "object",
+    "properties": {
+        "api_name": {
+            "type": "string",
+            "description": "Name of the API to call"
+        },
+        "endpoint_name": {
+            "type": "string",
+            "description": "Name of the endpoint to call"
+        },
+        "params": {
+            "type": "object",
+            "description": "Query parameters"
+        },
+        "path_params": {
+            "type": "object",
+            "description": "Values for {placeholders} in the endpoint path"
+        },
+        "data": {
+            "type": "object",
+            "description": "Request body data"
+        },
+        "json": {
+            "type": "object",
+            "description": "JSON data for the request"
+        }
+    },
+    "required": ["api_name", "endpoint_name"]
+})
+
+_BATCH_CALL_API_SCHEMA = MappingProxyType({
+    "type": "object",
+    "properties": {
+        "calls": {
+            "type": "array",
+            "description": "List of calls to execute in parallel",
+            "items": dict(_CALL_API_SCHEMA)
+        }
+    },
+    "required": ["calls"]
+})
+
+_CALL_API_STREAM_SCHEMA = MappingProxyType({
+    "type": "object",
+    "properties": {
+        "api_name": {
+            "type": "string",
+            "description": "Name of the API to call"
+        },
+        "endpoint_name": {
+            "type": "string",
+            "description": "Name of the endpoint to call"
+        },
+        "params": {
+            "type": "object",
+            "description": "Query parameters"
+        },
+        "path_params": {
+            "type": "object",
+            "description": "Values for {placeholders} in the endpoint path"
+        }
+    },
+    "required": ["api_name", "endpoint_name"]
+})
+
+_SET_CONCURRENCY_SCHEMA = MappingProxyType({
+    "type": "object",
+    "properties": {
+        "api_name": {
+            "type": "string",
+            "description": "Name of the API to tune"
+        },
+        "max": {
+            "type": "integer",
+            "description": "New maximum number of concurrent requests"
+        }
+    },
+    "required": ["api_name", "max"]
+})
+
 class APIEndpoint(BaseModel):
-    """Configuration for an API endpoint"""
+    """Configuration for an API endpoint
+
+    Frozen so the precomputed templates derived from a config at
+    registration time can never go stale.
+    """
+    model_config = ConfigDict(frozen=True, extra="ignore", validate_assignment=False)
+
     name: str
     base_url: str
     endpoints: Dict[str, Dict[str, Any]]
     headers: Optional[Dict[str, str]] = None
     auth_token: Optional[str] = None
+    max_concurrent: Optional[int] = None
+    retry_policy: Optional[Dict[str, Any]] = None
+
+class AdmissionController:
+    """Concurrency limiter that, unlike asyncio.Semaphore, can be resized at runtime"""
+
+    def __init__(self, max_concurrent: int):
+        self._cond = asyncio.Condition()
+        self._active = 0
+        self._max = max_concurrent
+
+    @property
+    def max_concurrent(self) -> int:
+        return self._max
+
+    async def acquire(self):
+        """Wait until a concurrency slot is free, then claim it"""
+        async with self._cond:
+            while self._active >= self._max:
+                await self._cond.wait()
+            self._active += 1
+
+    async def release(self):
+        """Give the slot back and wake one waiter"""
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify(1)
+
+    async def resize(self, new_max: int):
+        """Change the concurrency limit; wakes all waiters to re-check it"""
+        if new_max < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        async with self._cond:
+            self._max = new_max
+            self._cond.notify_all()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.release()
 
 class APIManager:
     """Manages API calls to different endpoints"""
-    
-    def __init__(self):
+
+    def __init__(self, limits: Optional[httpx.Limits] = None):
         self.apis: Dict[str, APIEndpoint] = {}
-        self.client = httpx.AsyncClient(timeout=30.0)
-    
+        self._compiled: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._cache: collections.OrderedDict = collections.OrderedDict()
+        self._controllers: Dict[str, AdmissionController] = {}
+        self._tool_index: Dict[str, tuple] = {}
+        self._info_json: Dict[str, str] = {}
+        self._factories: Dict[str, tuple] = {}
+        self._last_access: Dict[str, float] = {}
+        # When set, lazily loaded APIs beyond this count are evicted LRU
+        self.max_loaded: Optional[int] = None
+        self._tools_cache: Optional[List[types.Tool]] = None
+        self._resources_cache: Optional[List[types.Resource]] = None
+        self.limits = limits or httpx.Limits(
+            max_connections=200,
+            max_keepalive_connections=100,
+            keepalive_expiry=60
+        )
+        self.client: Optional[httpx.AsyncClient] = None
+
+    async def startup(self):
+        """Create the shared HTTP client on the running event loop"""
+        # No default Content-Type: httpx sets the right one per body kind
+        # (json= vs data=), and a client-wide default would mislabel
+        # form-encoded requests
+        self.client = httpx.AsyncClient(
+            http2=True,
+            limits=self.limits,
+            timeout=httpx.Timeout(connect=5, read=30, write=30, pool=5)
+        )
+        logger.info("HTTP client started")
+
     def register_api(self, api_config: APIEndpoint):
         """Register a new API configuration"""
         self.apis[api_config.name] = api_config
+        self._compiled[api_config.name] = {
+            endpoint_name: self._compile_endpoint(api_config, endpoint_config)
+            for endpoint_name, endpoint_config in api_config.endpoints.items()
+        }
+        self._controllers[api_config.name] = AdmissionController(api_config.max_concurrent or 10)
+        for endpoint_name in api_config.endpoints:
+            self._tool_index[f"{api_config.name}_{endpoint_name}"] = (api_config.name, endpoint_name)
+        # Configs are immutable after registration, so serialize the info
+        # resource once here instead of on every read
+        self._info_json[api_config.name] = orjson.dumps(
+            {
+                "name": api_config.name,
+                "base_url": api_config.base_url,
+                "endpoints": api_config.endpoints
+            },
+            option=orjson.OPT_INDENT_2
+        ).decode()
+        # Invalidate the memoized tool and resource lists
+        self._tools_cache = None
+        self._resources_cache = None
         logger.info(f"Registered API: {api_config.name}")
-    
-    async def call_api(self, api_name: str, endpoint_name: str, **kwargs) -> Dict[str, Any]:
-        """Make an API call to a specific endpoint"""
-        if api_name not in self.apis:
-            raise ValueError(f"API '{api_name}' not found")
-        
-        api = self.apis[api_name]
+
+    def register_lazy(self, name: str, factory, endpoints_meta: Optional[Dict[str, str]] = None):
+        """Register an API factory that is materialized on first use
+
+        endpoints_meta maps endpoint names to descriptions so the tool
+        list can advertise the API without instantiating it.
+        """
+        self._factories[name] = (factory, endpoints_meta or {})
+        for endpoint_name in (endpoints_meta or {}):
+            self._tool_index[f"{name}_{endpoint_name}"] = (name, endpoint_name)
+        self._tools_cache = None
+        self._resources_cache = None
+        logger.info(f"Registered lazy API: {name}")
+
+    def _resolve(self, name: str) -> APIEndpoint:
+        """Return a registered API, materializing it from its factory if needed"""
+        if name not in self.apis:
+            if name not in self._factories:
+                raise ValueError(f"API '{name}' not found")
+            factory, _ = self._factories[name]
+            self.register_api(factory())
+        self._last_access[name] = time.monotonic()
+        self._evict_lru()
+        return self.apis[name]
+
+    def unload(self, name: str):
+        """Drop the materialized state for a lazy API; it re-resolves on demand"""
+        if name not in self._factories:
+            raise ValueError(f"API '{name}' is not lazily registered")
+        self.apis.pop(name, None)
+        self._compiled.pop(name, None)
+        self._controllers.pop(name, None)
+        self._info_json.pop(name, None)
+        self._last_access.pop(name, None)
+        self._tools_cache = None
+        self._resources_cache = None
+        logger.info(f"Unloaded API: {name}")
+
+    def _evict_lru(self):
+        """Evict least-recently-used lazy APIs beyond the max_loaded bound"""
+        if self.max_loaded is None:
+            return
+        loaded = [
+            name for name in self._last_access
+            if name in self.apis and name in self._factories
+        ]
+        while len(loaded) > self.max_loaded:
+            oldest = min(loaded, key=self._last_access.__getitem__)
+            self.unload(oldest)
+            loaded.remove(oldest)
+
+    @staticmethod
+    def _compile_endpoint(api: APIEndpoint, endpoint_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Precompute the URL, merged headers and method for an endpoint"""
+        # Zero-copy merge: endpoint headers shadow the auth header, which
+        # shadows the API-level headers. httpx accepts any mapping, so no
+        # per-request dict copies are needed.
+        auth_headers = {"Authorization": f"Bearer {api.auth_token}"} if api.auth_token else {}
+        headers = collections.ChainMap(
+            endpoint_config.get("headers") or {},
+            auth_headers,
+            api.headers or {}
+        )
+
+        # Parse {placeholder} fields out of the URL once so per-request
+        # substitution is a plain join instead of str.format
+        url_template = urljoin(api.base_url, endpoint_config.get("path", ""))
+        parts = [
+            (literal, field)
+            for literal, field, _, _ in string.Formatter().parse(url_template)
+        ]
+        url_fn = None
+        if any(field for _, field in parts):
+            url_fn = lambda m, parts=parts: "".join(
+                literal + (str(m[field]) if field else "")
+                for literal, field in parts
+            )
+
+        # Per-endpoint retry policy overrides the per-API one, which
+        # overrides the defaults
+        retry = dict(DEFAULT_RETRY_POLICY)
+        if api.retry_policy:
+            retry.update(api.retry_policy)
+        if endpoint_config.get("retry_policy"):
+            retry.update(endpoint_config["retry_policy"])
+
+        return {
+            "url": url_template,
+            "url_fn": url_fn,
+            "headers": headers,
+            "method": endpoint_config.get("method", "GET").upper(),
+            "retry": retry
+        }
+
+    @staticmethod
+    def _cache_key(api_name: str, endpoint_name: str, params: Dict[str, Any], path_params: Dict[str, Any]):
+        """Build a hashable cache key, or None if the params cannot be hashed
+
+        httpx accepts list-valued query params for the repeated-param
+        form, so those are folded into tuples; anything else unhashable
+        just disables caching for the call.
+        """
+        try:
+            return (
+                api_name,
+                endpoint_name,
+                frozenset(
+                    (key, tuple(value) if isinstance(value, list) else value)
+                    for key, value in params.items()
+                ),
+                frozenset(path_params.items())
+            )
+        except TypeError:
+            return None
+
+    @staticmethod
+    def _parse_max_age(cache_control: str) -> Optional[float]:
+        """Extract the max-age value from a Cache-Control header, if any"""
+        for directive in cache_control.split(","):
+            directive = directive.strip()
+            if directive.startswith("max-age="):
+                try:
+                    return float(directive[len("max-age="):])
+                except ValueError:
+                    return None
+        return None
+
+    @staticmethod
+    def _backoff_delay(retry: Dict[str, Any], attempt: int) -> float:
+        """Jittered exponential backoff delay for the given attempt"""
+        delay = min(retry["max_delay"], retry["base_delay"] * 2 ** attempt)
+        return delay + random.random() * retry["jitter"]
+
+    async def _request_with_retry(self, api_name: str, retry: Dict[str, Any], **request_kwargs) -> httpx.Response:
+        """Issue a request, retrying transient failures with backoff"""
+        max_retries = retry["max_retries"]
+        for attempt in range(max_retries + 1):
+            try:
+                # Bound in-flight requests per API so one host cannot
+                # exhaust sockets; released while backing off
+                async with self._controllers[api_name]:
+                    response = await self.client.request(**request_kwargs)
+            except (httpx.ConnectError, httpx.ReadTimeout):
+                if attempt >= max_retries:
+                    raise
+                await asyncio.sleep(self._backoff_delay(retry, attempt))
+                continue
+
+            if response.status_code in RETRYABLE_STATUS_CODES and attempt < max_retries:
+                delay = self._backoff_delay(retry, attempt)
+                retry_after = response.headers.get("retry-after")
+                if retry_after:
+                    try:
+                        delay = max(delay, float(retry_after))
+                    except ValueError:
+                        pass
+                logger.warning(
+                    f"Retrying '{api_name}' after status {response.status_code} "
+                    f"(attempt {attempt + 1}/{max_retries})"
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            return response
+
+        return response
+
+    def _cache_store(self, cache_key, status_code: int, data: Any, response_headers) -> None:
+        """Store a GET response if the upstream allows caching or revalidation"""
+        cache_control = response_headers.get("cache-control", "")
+        if "no-store" in cache_control:
+            self._cache.pop(cache_key, None)
+            return
+
+        max_age = self._parse_max_age(cache_control)
+        etag = response_headers.get("etag")
+        last_modified = response_headers.get("last-modified")
+        if max_age is None and not etag and not last_modified:
+            return
+
+        self._cache[cache_key] = {
+            "status_code": status_code,
+            "data": data,
+            "etag": etag,
+            "last_modified": last_modified,
+            "expires_at": time.monotonic() + max_age if max_age is not None else None
+        }
+        self._cache.move_to_end(cache_key)
+        while len(self._cache) > CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
+
+
+    async def call_api(self, api_name: str, endpoint_name: str, stream: bool = False, raw: bool = False, **kwargs) -> Dict[str, Any]:
+        """Make an API call to a specific endpoint
+
+        With stream=True the body is read in chunks into a single buffer
+        instead of being materialized by httpx, halving peak memory for
+        large responses. With raw=True the body is returned as unparsed
+        bytes under "content" so callers (e.g. the batch tool) can splice
+        it into their output without a parse/re-serialize round-trip.
+        """
+        api = self._resolve(api_name)
         if endpoint_name not in api.endpoints:
             raise ValueError(f"Endpoint '{endpoint_name}' not found in API '{api_name}'")
         
-        endpoint_config = api.endpoints[endpoint_name]
-        
-        # Build URL
-        url = urljoin(api.base_url, endpoint_config.get("path", ""))
-        
-        # Prepare headers
-        headers = {}
-        if api.headers:
-            headers.update(api.headers)
-        if api.auth_token:
-            headers["Authorization"] = f"Bearer {api.auth_token}"
-        if endpoint_config.get("headers"):
-            headers.update(endpoint_config["headers"])
-        
-        # Prepare request parameters
-        method = endpoint_config.get("method", "GET").upper()
-        params = kwargs.get("params", {})
+        # Use the template precomputed at registration time
+        tmpl = self._compiled[api_name][endpoint_name]
+        headers = tmpl["headers"]
+        method = tmpl["method"]
+
+        # Prepare request parameters (clients may send explicit nulls)
+        params = kwargs.get("params") or {}
+        path_params = kwargs.get("path_params") or {}
         data = kwargs.get("data")
         json_data = kwargs.get("json")
-        
+
+        # Substitute path placeholders via the compiled interpolator
+        url_fn = tmpl["url_fn"]
+        url = url_fn(path_params) if url_fn is not None else tmpl["url"]
+
+        # Check the response cache (GET only)
+        cache_key = None
+        cached = None
+        if method == "GET" and not raw:
+            cache_key = self._cache_key(api_name, endpoint_name, params, path_params)
+            cached = self._cache.get(cache_key) if cache_key is not None else None
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+                expires_at = cached["expires_at"]
+                if expires_at is not None and time.monotonic() < expires_at:
+                    return {
+                        "status_code": cached["status_code"],
+                        "data": cached["data"],
+                        "success": True
+                    }
+                # Stale entry: ask the upstream to revalidate
+                headers = dict(headers)
+                if cached["etag"]:
+                    headers["If-None-Match"] = cached["etag"]
+                if cached["last_modified"]:
+                    headers["If-Modified-Since"] = cached["last_modified"]
+
         try:
-            response = await self.client.request(
+            if stream:
+                # Bound in-flight requests per API so one host cannot exhaust sockets
+                async with self._controllers[api_name]:
+                    buffer = bytearray()
+                    async with self.client.stream(
+                        method=method,
+                        url=url,
+                        headers=headers,
+                        params=params,
+                        json=json_data,
+                        data=data
+                    ) as response:
+                        # 304 from a revalidation request: the stale
+                        # cached body is still valid, same as the
+                        # buffered path below
+                        if cached is not None and response.status_code == 304:
+                            self._cache_store(cache_key, cached["status_code"], cached["data"], response.headers)
+                            return {
+                                "status_code": cached["status_code"],
+                                "data": cached["data"],
+                                "success": True
+                            }
+
+                        response.raise_for_status()
+                        async for chunk in response.aiter_bytes(65536):
+                            buffer.extend(chunk)
+
+                # Branch on Content-Type instead of paying for the
+                # exception when the upstream returns plain text
+                if "json" in response.headers.get("content-type", ""):
+                    try:
+                        result_data = orjson.loads(bytes(buffer))
+                    except orjson.JSONDecodeError:
+                        result_data = buffer.decode(errors="replace")
+                else:
+                    result_data = buffer.decode(errors="replace")
+
+                return {
+                    "status_code": response.status_code,
+                    "data": result_data,
+                    "success": True
+                }
+
+            response = await self._request_with_retry(
+                api_name,
+                tmpl["retry"],
                 method=method,
                 url=url,
                 headers=headers,
@@ -80,22 +559,46 @@ class APIManager:
                 json=json_data,
                 data=data
             )
-            response.raise_for_status()
-            
-            # Try to parse as JSON, fallback to text
-            try:
+
+            # 304 means the stale cached body is still valid
+            if cached is not None and response.status_code == 304:
+                self._cache_store(cache_key, cached["status_code"], cached["data"], response.headers)
                 return {
-                    "status_code": response.status_code,
-                    "data": response.json(),
+                    "status_code": cached["status_code"],
+                    "data": cached["data"],
                     "success": True
                 }
-            except json.JSONDecodeError:
+
+            response.raise_for_status()
+
+            if raw:
                 return {
                     "status_code": response.status_code,
-                    "data": response.text,
+                    "content": response.content,
+                    "is_json": "json" in response.headers.get("content-type", ""),
                     "success": True
                 }
-                
+
+            # Branch on Content-Type instead of paying for the exception
+            # when the upstream returns plain text; the try stays as a
+            # cheap guard against mislabeled bodies
+            if "json" in response.headers.get("content-type", ""):
+                try:
+                    result_data = orjson.loads(response.content)
+                except orjson.JSONDecodeError:
+                    result_data = response.text
+            else:
+                result_data = response.text
+
+            if cache_key is not None:
+                self._cache_store(cache_key, response.status_code, result_data, response.headers)
+
+            return {
+                "status_code": response.status_code,
+                "data": result_data,
+                "success": True
+            }
+
         except httpx.RequestError as e:
             return {
                 "status_code": 0,
@@ -109,63 +612,168 @@ class APIManager:
                 "success": False
             }
     
+    async def call_api_stream(self, api_name: str, endpoint_name: str, **kwargs):
+        """Stream an API response as decoded text chunks as they arrive
+
+        Useful for SSE endpoints and very large bodies where the caller
+        wants fragments instead of one buffered payload.
+        """
+        api = self._resolve(api_name)
+        if endpoint_name not in api.endpoints:
+            raise ValueError(f"Endpoint '{endpoint_name}' not found in API '{api_name}'")
+
+        tmpl = self._compiled[api_name][endpoint_name]
+
+        # Substitute path placeholders, same as the buffered path
+        path_params = kwargs.get("path_params") or {}
+        url_fn = tmpl["url_fn"]
+        url = url_fn(path_params) if url_fn is not None else tmpl["url"]
+
+        async with self._controllers[api_name]:
+            async with self.client.stream(
+                method=tmpl["method"],
+                url=url,
+                headers=tmpl["headers"],
+                params=kwargs.get("params", {}),
+                json=kwargs.get("json"),
+                data=kwargs.get("data")
+            ) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_text():
+                    yield chunk
+
+    async def set_concurrency(self, api_name: str, max_concurrent: int):
+        """Resize the concurrency limit for a registered API at runtime
+
+        Lazily registered APIs are materialized first so operators can
+        lower a limit before the API's first call.
+        """
+        if api_name not in self._controllers:
+            self._resolve(api_name)
+        await self._controllers[api_name].resize(max_concurrent)
+        logger.info(f"Concurrency for API '{api_name}' set to {max_concurrent}")
+
     async def close(self):
         """Close the HTTP client"""
-        await self.client.aclose()
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
 
 # Initialize the MCP server
 server = Server("api-integration-server")
 api_manager = APIManager()
 
-# Example API configurations - customize these for your APIs
-SAMPLE_APIS = [
-    APIEndpoint(
-        name="jsonplaceholder",
-        base_url="https://jsonplaceholder.typicode.com",
-        endpoints={
-            "get_posts": {
-                "path": "/posts",
-                "method": "GET",
-                "description": "Get all posts"
-            },
-            "get_post": {
-                "path": "/posts/{post_id}",
-                "method": "GET",
-                "description": "Get a specific post by ID"
-            },
-            "get_users": {
-                "path": "/users",
-                "method": "GET",
-                "description": "Get all users"
+# Prefer the C-backed YAML loader when libyaml is available
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Validates a whole config list in one shot instead of per-item models
+_API_LIST_ADAPTER = TypeAdapter(List[APIEndpoint])
+
+# Where validated configs are cached between boots, keyed by file hash
+CONFIG_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "mcp-apis")
+
+def load_apis(path: str = "apis.yaml") -> List[APIEndpoint]:
+    """Load and validate API configurations from a YAML file
+
+    The validated list is pickled under CONFIG_CACHE_DIR keyed by the
+    file's SHA-256, so an unchanged config skips both the YAML parse
+    and pydantic validation on subsequent boots. Returns an empty list
+    when the file does not exist.
+    """
+    if not os.path.exists(path):
+        return []
+
+    with open(path, "rb") as f:
+        raw = f.read()
+
+    digest = hashlib.sha256(raw).hexdigest()
+    cache_file = os.path.join(CONFIG_CACHE_DIR, f"apis.{digest}.pkl")
+
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, "rb") as f:
+                return pickle.load(f)
+        except Exception:
+            logger.warning(f"Discarding unreadable config cache: {cache_file}")
+
+    entries = yaml.load(raw, Loader=_YAML_LOADER) or []
+    apis = _API_LIST_ADAPTER.validate_python(entries)
+
+    os.makedirs(CONFIG_CACHE_DIR, exist_ok=True)
+    with open(cache_file, "wb") as f:
+        pickle.dump(apis, f)
+    logger.info(f"Loaded {len(apis)} API configs from {path}")
+
+    return apis
+
+# Example API configurations - customize these for your APIs.
+# Each entry maps an API name to a factory (called on first use) plus
+# lightweight endpoint metadata used to list tools without materializing
+# the full configuration.
+SAMPLE_APIS = {
+    "jsonplaceholder": {
+        "factory": lambda: APIEndpoint(
+            name="jsonplaceholder",
+            base_url="https://jsonplaceholder.typicode.com",
+            endpoints={
+                "get_posts": {
+                    "path": "/posts",
+                    "method": "GET",
+                    "description": "Get all posts"
+                },
+                "get_post": {
+                    "path": "/posts/{post_id}",
+                    "method": "GET",
+                    "description": "Get a specific post by ID"
+                },
+                "get_users": {
+                    "path": "/users",
+                    "method": "GET",
+                    "description": "Get all users"
+                }
             }
+        ),
+        "endpoints": {
+            "get_posts": "Get all posts",
+            "get_post": "Get a specific post by ID",
+            "get_users": "Get all users"
         }
-    ),
+    },
     # Add your own API configurations here
-    APIEndpoint(
-        name="weather_api",
-        base_url="https://api.openweathermap.org/data/2.5",
-        endpoints={
-            "current_weather": {
-                "path": "/weather",
-                "method": "GET",
-                "description": "Get current weather for a city"
+    "weather_api": {
+        "factory": lambda: APIEndpoint(
+            name="weather_api",
+            base_url="https://api.openweathermap.org/data/2.5",
+            endpoints={
+                "current_weather": {
+                    "path": "/weather",
+                    "method": "GET",
+                    "description": "Get current weather for a city"
+                },
+                "forecast": {
+                    "path": "/forecast",
+                    "method": "GET",
+                    "description": "Get weather forecast"
+                }
             },
-            "forecast": {
-                "path": "/forecast",
-                "method": "GET",
-                "description": "Get weather forecast"
-            }
-        },
-        headers={"Content-Type": "application/json"}
-        # Note: Add your API key in headers or auth_token
-    )
-]
+            headers={"Content-Type": "application/json"}
+            # Note: Add your API key in headers or auth_token
+        ),
+        "endpoints": {
+            "current_weather": "Get current weather for a city",
+            "forecast": "Get weather forecast"
+        }
+    }
+}
 
 @server.list_tools()
 async def handle_list_tools() -> List[types.Tool]:
     """List available tools (API endpoints)"""
+    if api_manager._tools_cache is not None:
+        return api_manager._tools_cache
+
     tools = []
-    
+
     for api_name, api in api_manager.apis.items():
         for endpoint_name, endpoint_config in api.endpoints.items():
             tool_name = f"{api_name}_{endpoint_name}"
@@ -173,23 +781,20 @@ async def handle_list_tools() -> List[types.Tool]:
                 types.Tool(
                     name=tool_name,
                     description=f"{api_name}: {endpoint_config.get('description', endpoint_name)}",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "params": {
-                                "type": "object",
-                                "description": "Query parameters for the API call"
-                            },
-                            "data": {
-                                "type": "object", 
-                                "description": "Request body data (for POST/PUT requests)"
-                            },
-                            "json": {
-                                "type": "object",
-                                "description": "JSON data for the request"
-                            }
-                        }
-                    }
+                    inputSchema=_TOOL_INPUT_SCHEMA
+                )
+            )
+
+    # Advertise lazily registered APIs from their metadata alone
+    for api_name, (factory, endpoints_meta) in api_manager._factories.items():
+        if api_name in api_manager.apis:
+            continue
+        for endpoint_name, description in endpoints_meta.items():
+            tools.append(
+                types.Tool(
+                    name=f"{api_name}_{endpoint_name}",
+                    description=f"{api_name}: {description}",
+                    inputSchema=_TOOL_INPUT_SCHEMA
                 )
             )
     
@@ -198,82 +803,170 @@ async def handle_list_tools() -> List[types.Tool]:
         types.Tool(
             name="call_api",
             description="Make a direct API call to any registered endpoint",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "api_name": {
-                        "type": "string",
-                        "description": "Name of the API to call"
-                    },
-                    "endpoint_name": {
-                        "type": "string", 
-                        "description": "Name of the endpoint to call"
-                    },
-                    "params": {
-                        "type": "object",
-                        "description": "Query parameters"
-                    },
-                    "data": {
-                        "type": "object",
-                        "description": "Request body data"
-                    },
-                    "json": {
-                        "type": "object",
-                        "description": "JSON data for the request"
-                    }
-                },
-                "required": ["api_name", "endpoint_name"]
-            }
+            inputSchema=_CALL_API_SCHEMA
         )
     )
-    
+
+    # Add a batching tool so N upstream calls cost one MCP round-trip
+    tools.append(
+        types.Tool(
+            name="batch_call_api",
+            description="Make several API calls in parallel and return their results as a JSON array",
+            inputSchema=_BATCH_CALL_API_SCHEMA
+        )
+    )
+
+    # Add a streaming variant that returns the body as text fragments
+    tools.append(
+        types.Tool(
+            name="call_api_stream",
+            description="Stream an API response from any registered endpoint as text chunks",
+            inputSchema=_CALL_API_STREAM_SCHEMA
+        )
+    )
+
+    # Add a tool to tune per-API concurrency at runtime
+    tools.append(
+        types.Tool(
+            name="set_concurrency",
+            description="Set the maximum number of concurrent requests for a registered API",
+            inputSchema=_SET_CONCURRENCY_SCHEMA
+        )
+    )
+
+    api_manager._tools_cache = tools
     return tools
 
+def _format_result(result: Dict[str, Any]) -> List[types.TextContent]:
+    """Render a call_api result dict as MCP text content"""
+    if result.get("success"):
+        formatted = orjson.dumps(
+            result["data"],
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+        ).decode()
+        response_text = f"API call successful!\n\nStatus: {result['status_code']}\nResponse:\n{formatted}"
+    else:
+        response_text = f"API call failed!\n\nStatus: {result.get('status_code', 'Unknown')}\nError: {result.get('error', 'Unknown error')}"
+
+    return [types.TextContent(type="text", text=response_text)]
+
+async def _handle_call_api(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Direct API call to any registered endpoint"""
+    result = await api_manager.call_api(
+        api_name=arguments.get("api_name"),
+        endpoint_name=arguments.get("endpoint_name"),
+        params=arguments.get("params", {}),
+        path_params=arguments.get("path_params", {}),
+        data=arguments.get("data"),
+        json=arguments.get("json")
+    )
+    return _format_result(result)
+
+async def _handle_batch_call_api(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Run several calls in parallel and splice the results into one JSON array"""
+    calls = arguments.get("calls", [])
+    results = await asyncio.gather(
+        *(api_manager.call_api(
+            api_name=call.get("api_name"),
+            endpoint_name=call.get("endpoint_name"),
+            raw=True,
+            params=call.get("params", {}),
+            path_params=call.get("path_params", {}),
+            data=call.get("data"),
+            json=call.get("json")
+        ) for call in calls),
+        return_exceptions=True
+    )
+
+    # Splice the raw upstream bodies into one JSON array without
+    # parsing and re-serializing each payload
+    fragments = []
+    for result in results:
+        if isinstance(result, BaseException):
+            fragments.append(orjson.dumps(
+                {"status_code": 0, "error": str(result), "success": False}
+            ))
+        elif not result.get("success"):
+            fragments.append(orjson.dumps(result))
+        elif result["is_json"]:
+            fragments.append(
+                b'{"status_code":%d,"success":true,"data":' % result["status_code"]
+                + result["content"] + b"}"
+            )
+        else:
+            fragments.append(orjson.dumps({
+                "status_code": result["status_code"],
+                "data": result["content"].decode(errors="replace"),
+                "success": True
+            }))
+
+    return [types.TextContent(
+        type="text",
+        text=(b"[" + b",".join(fragments) + b"]").decode()
+    )]
+
+async def _handle_call_api_stream(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Forward the response body as text fragments"""
+    parts = []
+    async for chunk in api_manager.call_api_stream(
+        api_name=arguments.get("api_name"),
+        endpoint_name=arguments.get("endpoint_name"),
+        params=arguments.get("params", {}),
+        path_params=arguments.get("path_params", {})
+    ):
+        parts.append(types.TextContent(type="text", text=chunk))
+    return parts or [types.TextContent(type="text", text="")]
+
+async def _handle_set_concurrency(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Resize a registered API's concurrency limit"""
+    api_name = arguments.get("api_name")
+    max_concurrent = int(arguments.get("max"))
+    await api_manager.set_concurrency(api_name, max_concurrent)
+    return [types.TextContent(
+        type="text",
+        text=f"Concurrency for API '{api_name}' set to {max_concurrent}"
+    )]
+
+# Tool name -> bound coroutine; endpoint tools are added on first use so
+# dispatch is a single dict lookup with no per-request branching
+_HANDLERS: Dict[str, Any] = {
+    "call_api": _handle_call_api,
+    "batch_call_api": _handle_batch_call_api,
+    "call_api_stream": _handle_call_api_stream,
+    "set_concurrency": _handle_set_concurrency
+}
+
+def _make_endpoint_handler(api_name: str, endpoint_name: str):
+    """Build a handler bound to one (api, endpoint) pair"""
+    async def handler(arguments: Dict[str, Any]) -> List[types.TextContent]:
+        result = await api_manager.call_api(
+            api_name=api_name,
+            endpoint_name=endpoint_name,
+            params=arguments.get("params", {}),
+            path_params=arguments.get("path_params", {}),
+            data=arguments.get("data"),
+            json=arguments.get("json")
+        )
+        return _format_result(result)
+    return handler
+
 @server.call_tool()
 async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Handle tool calls"""
     try:
-        if name == "call_api":
-            # Direct API call
-            api_name = arguments.get("api_name")
-            endpoint_name = arguments.get("endpoint_name")
-            params = arguments.get("params", {})
-            data = arguments.get("data")
-            json_data = arguments.get("json")
-            
-            result = await api_manager.call_api(
-                api_name=api_name,
-                endpoint_name=endpoint_name,
-                params=params,
-                data=data,
-                json=json_data
-            )
-        else:
-            # Parse tool name to extract API and endpoint
-            if "_" not in name:
-                raise ValueError(f"Invalid tool name format: {name}")
-            
-            api_name, endpoint_name = name.split("_", 1)
-            params = arguments.get("params", {})
-            data = arguments.get("data")
-            json_data = arguments.get("json")
-            
-            result = await api_manager.call_api(
-                api_name=api_name,
-                endpoint_name=endpoint_name,
-                params=params,
-                data=data,
-                json=json_data
-            )
-        
-        # Format the result
-        if result.get("success"):
-            response_text = f"API call successful!\n\nStatus: {result['status_code']}\nResponse:\n{json.dumps(result['data'], indent=2)}"
-        else:
-            response_text = f"API call failed!\n\nStatus: {result.get('status_code', 'Unknown')}\nError: {result.get('error', 'Unknown error')}"
-            
-        return [types.TextContent(type="text", text=response_text)]
-        
+        handler = _HANDLERS.get(name)
+        if handler is None:
+            # Resolve the tool name via the index built at registration
+            # time and memoize the bound handler
+            try:
+                api_name, endpoint_name = api_manager._tool_index[name]
+            except KeyError:
+                raise ValueError(f"Unknown tool: {name}")
+            handler = _make_endpoint_handler(api_name, endpoint_name)
+            _HANDLERS[name] = handler
+
+        return await handler(arguments)
+
     except Exception as e:
         error_msg = f"Error calling API: {str(e)}"
         logger.error(error_msg)
@@ -282,8 +975,11 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[types.T
 @server.list_resources()
 async def handle_list_resources() -> List[types.Resource]:
     """List available resources"""
+    if api_manager._resources_cache is not None:
+        return api_manager._resources_cache
+
     resources = []
-    
+
     for api_name, api in api_manager.apis.items():
         resources.append(
             types.Resource(
@@ -293,7 +989,21 @@ async def handle_list_resources() -> List[types.Resource]:
                 mimeType="application/json"
             )
         )
-    
+
+    # Advertise lazily registered APIs that are not materialized yet
+    for api_name in api_manager._factories:
+        if api_name in api_manager.apis:
+            continue
+        resources.append(
+            types.Resource(
+                uri=f"api://{api_name}/info",
+                name=f"{api_name} API Info",
+                description=f"Information about the {api_name} API endpoints",
+                mimeType="application/json"
+            )
+        )
+
+    api_manager._resources_cache = resources
     return resources
 
 @server.read_resource()
@@ -303,21 +1013,28 @@ async def handle_read_resource(uri: str) -> str:
         parts = uri.replace("api://", "").split("/")
         if len(parts) >= 2 and parts[1] == "info":
             api_name = parts[0]
-            if api_name in api_manager.apis:
-                api = api_manager.apis[api_name]
-                return json.dumps({
-                    "name": api.name,
-                    "base_url": api.base_url,
-                    "endpoints": api.endpoints
-                }, indent=2)
+            if api_name not in api_manager._info_json and api_name in api_manager._factories:
+                api_manager._resolve(api_name)
+            if api_name in api_manager._info_json:
+                # Serialized once at registration time
+                return api_manager._info_json[api_name]
     
     raise ValueError(f"Unknown resource: {uri}")
 
 async def main():
     """Main function to run the MCP server"""
-    # Register sample APIs
-    for api_config in SAMPLE_APIS:
-        api_manager.register_api(api_config)
+    # Bind the HTTP client to the running event loop
+    await api_manager.startup()
+
+    # Prefer configurations from apis.yaml; fall back to the in-code
+    # samples (registered lazily) when the file is absent
+    configured_apis = load_apis()
+    if configured_apis:
+        for api_config in configured_apis:
+            api_manager.register_api(api_config)
+    else:
+        for api_name, spec in SAMPLE_APIS.items():
+            api_manager.register_lazy(api_name, spec["factory"], spec["endpoints"])
     
     # You can add your own API configurations here
     # Example:
@@ -353,4 +1070,11 @@ async def main():
         await api_manager.close()
 
 if __name__ == "__main__":
+    # Use the libuv event loop when available; pure drop-in speedup
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     asyncio.run(main())
\ No newline at end of file
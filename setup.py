@@ -7,8 +7,11 @@ setup(
     packages=find_packages(),
     install_requires=[
         "mcp>=1.0.0",
-        "httpx>=0.25.0", 
+        "httpx[http2]>=0.25.0", 
         "pydantic>=2.0.0",
+        "orjson>=3.9.0",
+        "pyyaml>=6.0",
+        "uvloop; python_version < '3.13'",
         "asyncio-mqtt",
     ],
     python_requires=">=3.9",